@@ -52,9 +52,9 @@ async def create_rule(rule: RuleCreate):
     """Create a new firewall rule."""
     try:
         new_rule = Rule(**rule.dict())
-        firewall.rules.append(new_rule)
-        firewall.rules.sort(key=lambda x: x.priority)
-        return RuleResponse(id=len(firewall.rules)-1, **rule.dict())
+        firewall.add_rule(new_rule)
+        rule_id = next(i for i, r in enumerate(firewall.rules) if r is new_rule)
+        return RuleResponse(id=rule_id, **rule.dict())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -63,7 +63,7 @@ async def delete_rule(rule_id: int):
     """Delete a firewall rule."""
     try:
         if 0 <= rule_id < len(firewall.rules):
-            firewall.rules.pop(rule_id)
+            firewall.remove_rule(firewall.rules[rule_id])
             return {"message": "Rule deleted successfully"}
         raise HTTPException(status_code=404, detail="Rule not found")
     except Exception as e:
@@ -79,4 +79,8 @@ async def get_threats():
 
 def start_api_server():
     """Start the API server."""
-    uvicorn.run(app, host="0.0.0.0", port=8
+    uvicorn.run(app, host="0.0.0.0", port=8080)
+
+if __name__ == "__main__":
+    start_api_server()
+
@@ -1,11 +1,11 @@
 import logging
 from dataclasses import dataclass
 from typing import List, Dict, Optional
-from datetime import datetime
 import netfilterqueue
-import scapy.all as scapy
 from .ml_module import MLModule
 from .threat_intel import ThreatIntelligence
+from .rule_index import CompiledRule, RuleIndex
+from .packet_parser import PacketRecord, parse_packet
 
 @dataclass
 class Rule:
@@ -21,6 +21,7 @@ class FirewallEngine:
     def __init__(self, config_path: str):
         self.logger = logging.getLogger(__name__)
         self.rules: List[Rule] = []
+        self.rule_index = RuleIndex()
         self.ml_module = MLModule()
         self.threat_intel = ThreatIntelligence()
         self.packet_queue = netfilterqueue.NetfilterQueue()
@@ -37,6 +38,7 @@ class FirewallEngine:
             for rule_config in config.get('rules', []):
                 rule = Rule(**rule_config)
                 self.rules.append(rule)
+                self.rule_index.add(rule)
                 
             self.rules.sort(key=lambda x: x.priority)
             self.logger.info(f"Loaded {len(self.rules)} rules")
@@ -47,41 +49,33 @@ class FirewallEngine:
     def process_packet(self, packet):
         """Process a single packet and decide its fate."""
         try:
-            # Convert netfilterqueue packet to scapy packet for easier handling
-            scapy_packet = scapy.IP(packet.get_payload())
-            
-            # Extract packet information
-            packet_info = {
-                'source_ip': scapy_packet.src,
-                'dest_ip': scapy_packet.dst,
-                'protocol': scapy_packet.proto,
-                'timestamp': datetime.now()
-            }
+            # Read the IP and transport headers straight from the payload
+            packet_info = parse_packet(packet.get_payload())
             
             # Check threat intelligence
-            if self.threat_intel.is_malicious(packet_info['source_ip']):
-                self.logger.warning(f"Blocked malicious IP: {packet_info['source_ip']}")
+            if self.threat_intel.is_malicious(packet_info.source_ip):
+                self.logger.warning(f"Blocked malicious IP: {packet_info.source_ip}")
                 packet.drop()
                 return
             
             # Get ML model prediction
             ml_decision = self.ml_module.predict(packet_info)
             if ml_decision == 'DROP':
-                self.logger.info(f"ML model suggested blocking packet from {packet_info['source_ip']}")
+                self.logger.info(f"ML model suggested blocking packet from {packet_info.source_ip}")
                 packet.drop()
                 return
             
             # Apply rules
-            for rule in self.rules:
-                if self._packet_matches_rule(packet_info, rule):
-                    if rule.action == 'ACCEPT':
-                        packet.accept()
-                    elif rule.action == 'DROP':
-                        packet.drop()
-                    elif rule.action == 'LOG':
-                        self.logger.info(f"Logged packet: {packet_info}")
-                        packet.accept()
-                    return
+            rule = self.rule_index.lookup(packet_info)
+            if rule is not None:
+                if rule.action == 'ACCEPT':
+                    packet.accept()
+                elif rule.action == 'DROP':
+                    packet.drop()
+                elif rule.action == 'LOG':
+                    self.logger.info(f"Logged packet: {packet_info}")
+                    packet.accept()
+                return
             
             # Default action: accept
             packet.accept()
@@ -90,16 +84,20 @@ class FirewallEngine:
             self.logger.error(f"Error processing packet: {str(e)}")
             packet.accept()  # Accept on error to prevent network disruption
     
-    def _packet_matches_rule(self, packet_info: Dict, rule: Rule) -> bool:
+    def add_rule(self, rule: Rule) -> None:
+        """Add a rule and index it without recompiling the existing rules."""
+        self.rules.append(rule)
+        self.rules.sort(key=lambda x: x.priority)
+        self.rule_index.add(rule)
+
+    def remove_rule(self, rule: Rule) -> None:
+        """Remove a rule from the rule list and the index."""
+        self.rules = [r for r in self.rules if r is not rule]
+        self.rule_index.remove(rule)
+
+    def _packet_matches_rule(self, packet_info: PacketRecord, rule: Rule) -> bool:
         """Check if a packet matches a rule."""
-        if rule.protocol and packet_info['protocol'] != rule.protocol:
-            return False
-        if rule.source_ip and packet_info['source_ip'] != rule.source_ip:
-            return False
-        if rule.dest_ip and packet_info['dest_ip'] != rule.dest_ip:
-            return False
-        # Add more matching criteria as needed
-        return True
+        return CompiledRule(rule).matches(packet_info)
     
     def start(self):
         """Start the firewall engine."""
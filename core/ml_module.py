@@ -1,8 +1,11 @@
 import logging
-from typing import Dict, List
+import time
+from typing import List
 import numpy as np
 from sklearn.ensemble import IsolationForest
 from collections import deque
+from .packet_parser import PacketRecord
+from .prefix_trie import parse_address
 
 class MLModule:
     def __init__(self, window_size: int = 1000):
@@ -12,25 +15,24 @@ class MLModule:
         self.packet_history = deque(maxlen=window_size)
         self.is_trained = False
         
-    def _extract_features(self, packet_info: Dict) -> np.ndarray:
+    def _extract_features(self, packet_info: PacketRecord) -> np.ndarray:
         """Extract relevant features from packet info for ML model."""
         features = []
         
-        # Convert IP to numerical representation
-        ip_parts = list(map(int, packet_info['source_ip'].split('.')))
-        features.extend(ip_parts)
+        # Convert IP to numerical representation (low 32 bits for IPv6)
+        _, address = parse_address(packet_info.source_ip)
+        features.extend((address & 0xFFFFFFFF).to_bytes(4, 'big'))
         
         # Add protocol as feature
-        features.append(packet_info['protocol'])
+        features.append(packet_info.protocol)
         
         # Add time-based features
-        hour = packet_info['timestamp'].hour
-        minute = packet_info['timestamp'].minute
-        features.extend([hour, minute])
+        timestamp = time.localtime(packet_info.timestamp)
+        features.extend([timestamp.tm_hour, timestamp.tm_min])
         
         return np.array(features).reshape(1, -1)
     
-    def train(self, packet_history: List[Dict]):
+    def train(self, packet_history: List[PacketRecord]):
         """Train the ML model on historical packet data."""
         try:
             if len(packet_history) < self.window_size // 2:
@@ -45,7 +47,7 @@ class MLModule:
         except Exception as e:
             self.logger.error(f"Error training ML model: {str(e)}")
     
-    def predict(self, packet_info: Dict) -> str:
+    def predict(self, packet_info: PacketRecord) -> str:
         """Predict whether a packet should be accepted or dropped."""
         try:
             # Add to history
@@ -70,7 +72,7 @@ class MLModule:
             self.logger.error(f"Error in ML prediction: {str(e)}")
             return 'ACCEPT'  # Accept on error
     
-    def update(self, packet_info: Dict, label: str):
+    def update(self, packet_info: PacketRecord, label: str):
         """Update the model with new labeled data."""
         try:
             self.packet_history.append(packet_info)
@@ -0,0 +1,126 @@
+import socket
+import struct
+import time
+from typing import Optional
+
+# Version/IHL, TOS, total length, ID, flags/fragment offset, TTL, protocol,
+# checksum, source address, destination address
+_IPV4_HEADER = struct.Struct('!BBHHHBBH4s4s')
+# Version/class/flow label, payload length, next header, hop limit, addresses
+_IPV6_HEADER = struct.Struct('!IHBB16s16s')
+_PORTS = struct.Struct('!HH')
+
+IPV4_HEADER_LEN = _IPV4_HEADER.size
+IPV6_HEADER_LEN = _IPV6_HEADER.size
+
+PROTO_TCP = 6
+PROTO_UDP = 17
+
+TCP_FIN = 0x01
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+# IPv6 extension headers that may precede the transport header
+_IPV6_HOP_BY_HOP = 0
+_IPV6_ROUTING = 43
+_IPV6_FRAGMENT = 44
+_IPV6_AUTH = 51
+_IPV6_DEST_OPTS = 60
+
+class PacketRecord:
+    """Header fields of a single packet, filled in by parse_packet."""
+
+    __slots__ = ('version', 'source_ip', 'dest_ip', 'protocol', 'source_port',
+                 'dest_port', 'length', 'tcp_flags', 'timestamp')
+
+    def __init__(self, version: int = 4, source_ip: str = '', dest_ip: str = '',
+                 protocol: int = 0, source_port: Optional[int] = None,
+                 dest_port: Optional[int] = None, length: int = 0,
+                 tcp_flags: int = 0, timestamp: float = 0.0):
+        self.version = version
+        self.source_ip = source_ip
+        self.dest_ip = dest_ip
+        self.protocol = protocol
+        self.source_port = source_port
+        self.dest_port = dest_port
+        self.length = length
+        self.tcp_flags = tcp_flags
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PacketRecord({fields})"
+
+def _parse_transport(record: PacketRecord, data: memoryview, offset: int) -> None:
+    """Read ports and TCP flags from the transport header at offset."""
+    if record.protocol not in (PROTO_TCP, PROTO_UDP) or len(data) < offset + _PORTS.size:
+        return
+    record.source_port, record.dest_port = _PORTS.unpack_from(data, offset)
+    if record.protocol == PROTO_TCP and len(data) > offset + 13:
+        record.tcp_flags = data[offset + 13]
+
+def parse_packet(payload, record: Optional[PacketRecord] = None) -> PacketRecord:
+    """Parse IPv4/IPv6 and TCP/UDP headers from a raw IP packet.
+
+    Fields are read in place from the payload buffer; nothing past the headers
+    is copied. Ports are only set for the first fragment of a TCP or UDP
+    packet. Pass ``record`` to reuse an existing PacketRecord. Raises
+    ValueError for truncated or non-IP payloads.
+    """
+    data = memoryview(payload)
+    if record is None:
+        record = PacketRecord()
+    else:
+        record.source_port = record.dest_port = None
+        record.tcp_flags = 0
+    record.timestamp = time.time()
+    if not data:
+        raise ValueError("Empty packet")
+
+    version = data[0] >> 4
+    if version == 4:
+        if len(data) < IPV4_HEADER_LEN:
+            raise ValueError("Truncated IPv4 header")
+        (version_ihl, _, total_length, _, fragment, _, protocol, _,
+         source, dest) = _IPV4_HEADER.unpack_from(data)
+        header_len = (version_ihl & 0x0F) * 4
+        if header_len < IPV4_HEADER_LEN:
+            raise ValueError("Invalid IPv4 header length")
+        record.version = 4
+        record.source_ip = socket.inet_ntop(socket.AF_INET, source)
+        record.dest_ip = socket.inet_ntop(socket.AF_INET, dest)
+        record.protocol = protocol
+        record.length = total_length
+        if not fragment & 0x1FFF:
+            _parse_transport(record, data, header_len)
+        return record
+
+    if version == 6:
+        if len(data) < IPV6_HEADER_LEN:
+            raise ValueError("Truncated IPv6 header")
+        _, payload_length, next_header, _, source, dest = _IPV6_HEADER.unpack_from(data)
+        record.version = 6
+        record.source_ip = socket.inet_ntop(socket.AF_INET6, source)
+        record.dest_ip = socket.inet_ntop(socket.AF_INET6, dest)
+        record.length = IPV6_HEADER_LEN + payload_length
+        offset = IPV6_HEADER_LEN
+        first_fragment = True
+        while len(data) >= offset + 8:
+            if next_header in (_IPV6_HOP_BY_HOP, _IPV6_ROUTING, _IPV6_DEST_OPTS):
+                header_len = (data[offset + 1] + 1) * 8
+            elif next_header == _IPV6_FRAGMENT:
+                header_len = 8
+                first_fragment = not (data[offset + 2] << 8 | data[offset + 3]) & 0xFFF8
+            elif next_header == _IPV6_AUTH:
+                header_len = (data[offset + 1] + 2) * 4
+            else:
+                break
+            next_header = data[offset]
+            offset += header_len
+        record.protocol = next_header
+        if first_fragment:
+            _parse_transport(record, data, offset)
+        return record
+
+    raise ValueError(f"Unsupported IP version: {version}")
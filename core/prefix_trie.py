@@ -0,0 +1,412 @@
+import socket
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+ADDRESS_WIDTHS = {4: 32, 6: 128}
+
+_EMPTY = object()
+
+# Number of leading address bits resolved by a direct table lookup in contains()
+JUMP_BITS = 16
+
+def parse_address(ip: str) -> Tuple[int, int]:
+    """Convert an IP address string to an (ip version, integer) pair."""
+    try:
+        if ':' in ip:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), 'big')
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+    except OSError:
+        raise ValueError(f"Invalid IP address: {ip}") from None
+
+def parse_network(network: str) -> Tuple[int, int, int]:
+    """Convert an address or CIDR string to (ip version, network, prefix length).
+
+    Host bits below the prefix length are cleared, so "10.1.2.3/16" parses
+    to the same network as "10.1.0.0/16".
+    """
+    address, _, length = network.partition('/')
+    version, value = parse_address(address.strip())
+    width = ADDRESS_WIDTHS[version]
+    prefix_len = int(length) if length else width
+    if not 0 <= prefix_len <= width:
+        raise ValueError(f"Invalid prefix length in {network}")
+    host_bits = width - prefix_len
+    return version, (value >> host_bits) << host_bits, prefix_len
+
+def is_valid_network(network: str) -> bool:
+    """Check whether a string is a valid address or CIDR network."""
+    try:
+        parse_network(network)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+def networks_overlap(first: str, second: str) -> bool:
+    """Check whether two address or CIDR networks share any address."""
+    version, key, prefix_len = parse_network(first)
+    other_version, other_key, other_len = parse_network(second)
+    if version != other_version:
+        return False
+    shift = ADDRESS_WIDTHS[version] - min(prefix_len, other_len)
+    return not (key ^ other_key) >> shift
+
+def format_network(version: int, network: int, prefix_len: int) -> str:
+    """Format a network as CIDR, or as a bare address for a single host."""
+    width = ADDRESS_WIDTHS[version]
+    family = socket.AF_INET if version == 4 else socket.AF_INET6
+    address = socket.inet_ntop(family, network.to_bytes(width // 8, 'big'))
+    return address if prefix_len == width else f"{address}/{prefix_len}"
+
+def range_to_prefixes(start: int, end: int, width: int) -> List[Tuple[int, int]]:
+    """Split the inclusive integer range [start, end] into aligned prefixes."""
+    prefixes = []
+    while start <= end:
+        # Largest block that is aligned at start and does not overshoot end
+        align = (start & -start).bit_length() - 1 if start else width
+        size = min(align, (end - start + 1).bit_length() - 1)
+        prefixes.append((start, width - size))
+        start += 1 << size
+    return prefixes
+
+def collapse_prefixes(prefixes: Iterable[Tuple[int, int]], width: int) -> List[Tuple[int, int]]:
+    """Merge overlapping and adjacent prefixes into the fewest covering prefixes."""
+    ranges = sorted((net, net + (1 << (width - plen)) - 1) for net, plen in prefixes)
+    merged: List[List[int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    result = []
+    for start, end in merged:
+        result.extend(range_to_prefixes(start, end, width))
+    return result
+
+class PrefixTrie:
+    """Path-compressed binary (Patricia) trie mapping IP prefixes to values.
+
+    Nodes are stored in parallel arrays rather than as Python objects, so a
+    trie holding millions of prefixes costs a few tens of bytes per node.
+    Lookups walk at most ``width`` nodes. Node 0 is the root (the /0 prefix)
+    and a child index of 0 therefore means "no child". Deleting a prefix only
+    clears its value; build a new trie to reclaim the nodes.
+
+    ``contains`` first resolves the leading ``JUMP_BITS`` bits through a
+    direct-indexed table, built lazily after the trie changes, and only walks
+    the few nodes below that, which keeps membership tests cheap in Python.
+    """
+
+    def __init__(self, width: int = 32):
+        self.width = width
+        self._keys = array('Q') if width <= 64 else []
+        self._prefix_lens = array('B')
+        self._left = array('I')
+        self._right = array('I')
+        self._values: List[Any] = []
+        self._count = 0
+        self._jump: Optional[array] = None
+        self._jump_hit: Optional[bytearray] = None
+        self._new_node(0, 0, _EMPTY)
+
+    def _new_node(self, key: int, prefix_len: int, value: Any) -> int:
+        self._keys.append(key)
+        self._prefix_lens.append(prefix_len)
+        self._left.append(0)
+        self._right.append(0)
+        self._values.append(value)
+        return len(self._values) - 1
+
+    def _bit(self, key: int, position: int) -> int:
+        return (key >> (self.width - 1 - position)) & 1
+
+    def _set_child(self, node: int, bit: int, child: int) -> None:
+        if bit:
+            self._right[node] = child
+        else:
+            self._left[node] = child
+
+    def _find(self, key: int, prefix_len: int) -> int:
+        """Return the node holding exactly this prefix, or 0 if absent."""
+        node = 0
+        width = self.width
+        while True:
+            node_len = self._prefix_lens[node]
+            if node_len == prefix_len:
+                return node if self._keys[node] == key else 0
+            if node_len > prefix_len:
+                return 0
+            bit = (key >> (width - 1 - node_len)) & 1
+            child = self._right[node] if bit else self._left[node]
+            if not child:
+                return 0
+            child_len = self._prefix_lens[child]
+            if child_len <= prefix_len and (key ^ self._keys[child]) >> (width - child_len):
+                return 0
+            node = child
+
+    def insert(self, key: int, prefix_len: int, value: Any = True) -> None:
+        """Store a value under a prefix, replacing any existing value."""
+        self._jump = None
+        width = self.width
+        key = (key >> (width - prefix_len)) << (width - prefix_len) if prefix_len < width else key
+        node = 0
+        while True:
+            if self._prefix_lens[node] == prefix_len:
+                if self._values[node] is _EMPTY:
+                    self._count += 1
+                self._values[node] = value
+                return
+            bit = self._bit(key, self._prefix_lens[node])
+            child = self._right[node] if bit else self._left[node]
+            if not child:
+                self._set_child(node, bit, self._new_node(key, prefix_len, value))
+                self._count += 1
+                return
+            child_key = self._keys[child]
+            child_len = self._prefix_lens[child]
+            common = min(width - (key ^ child_key).bit_length(), prefix_len, child_len)
+            if common == child_len:
+                node = child
+                continue
+            if common == prefix_len:
+                new = self._new_node(key, prefix_len, value)
+                self._set_child(new, self._bit(child_key, prefix_len), child)
+                self._count += 1
+            else:
+                glue_key = (key >> (width - common)) << (width - common) if common else 0
+                new = self._new_node(glue_key, common, _EMPTY)
+                leaf = self._new_node(key, prefix_len, value)
+                self._set_child(new, self._bit(key, common), leaf)
+                self._set_child(new, self._bit(child_key, common), child)
+                self._count += 1
+            self._set_child(node, bit, new)
+            return
+
+    def get(self, key: int, prefix_len: int, default: Any = None) -> Any:
+        """Return the value stored under exactly this prefix."""
+        node = self._find(key, prefix_len)
+        if prefix_len == 0 or node:
+            value = self._values[node]
+            if value is not _EMPTY:
+                return value
+        return default
+
+    def delete(self, key: int, prefix_len: int) -> bool:
+        """Remove the value stored under exactly this prefix."""
+        node = self._find(key, prefix_len)
+        if (node or prefix_len == 0) and self._values[node] is not _EMPTY:
+            self._jump = None
+            self._values[node] = _EMPTY
+            self._count -= 1
+            return True
+        return False
+
+    def delete_covered(self, key: int, prefix_len: int) -> int:
+        """Remove every prefix equal to or more specific than the given one."""
+        width = self.width
+        node = 0
+        while True:
+            node_len = self._prefix_lens[node]
+            if node_len >= prefix_len:
+                if prefix_len and (key ^ self._keys[node]) >> (width - prefix_len):
+                    return 0
+                return self._clear_subtree(node)
+            bit = (key >> (width - 1 - node_len)) & 1
+            child = self._right[node] if bit else self._left[node]
+            if not child:
+                return 0
+            child_len = self._prefix_lens[child]
+            shift = width - min(child_len, prefix_len)
+            if (key ^ self._keys[child]) >> shift:
+                return 0
+            node = child
+
+    def _clear_subtree(self, node: int) -> int:
+        self._jump = None
+        removed = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self._values[current] is not _EMPTY:
+                self._values[current] = _EMPTY
+                removed += 1
+            for child in (self._left[current], self._right[current]):
+                if child:
+                    stack.append(child)
+        self._count -= removed
+        return removed
+
+    def _walk(self, address: int) -> Iterator[int]:
+        """Yield the nodes on the path to an address, shortest prefix first."""
+        width = self.width
+        keys, lens, left, right = self._keys, self._prefix_lens, self._left, self._right
+        node = 0
+        while True:
+            yield node
+            node_len = lens[node]
+            if node_len == width:
+                return
+            if (address >> (width - 1 - node_len)) & 1:
+                node = right[node]
+            else:
+                node = left[node]
+            if not node or (address ^ keys[node]) >> (width - lens[node]):
+                return
+
+    def longest_match(self, address: int) -> Optional[Tuple[int, int, Any]]:
+        """Return (network, prefix length, value) of the most specific covering prefix."""
+        best = None
+        values = self._values
+        for node in self._walk(address):
+            if values[node] is not _EMPTY:
+                best = node
+        if best is None:
+            return None
+        return self._keys[best], self._prefix_lens[best], values[best]
+
+    def shortest_match(self, address: int) -> Optional[Tuple[int, int, Any]]:
+        """Return (network, prefix length, value) of the least specific covering prefix."""
+        values = self._values
+        for node in self._walk(address):
+            if values[node] is not _EMPTY:
+                return self._keys[node], self._prefix_lens[node], values[node]
+        return None
+
+    def matches(self, address: int) -> List[Any]:
+        """Return the values of every prefix covering an address, shortest first."""
+        values = self._values
+        return [values[node] for node in self._walk(address) if values[node] is not _EMPTY]
+
+    def _build_jump_table(self) -> None:
+        """Map each value of the leading bits to the deepest node above the cut."""
+        shift = JUMP_BITS
+        jump = array('I', bytes(4 << shift))
+        hit = bytearray(1 << shift)
+        # Parents are visited before children, so deeper nodes overwrite their range
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            node_len = self._prefix_lens[node]
+            start = self._keys[node] >> (self.width - shift)
+            end = start + (1 << (shift - node_len))
+            jump[start:end] = array('I', [node]) * (end - start)
+            if self._values[node] is not _EMPTY:
+                hit[start:end] = b'\x01' * (end - start)
+            for child in (self._left[node], self._right[node]):
+                if child and self._prefix_lens[child] <= shift:
+                    stack.append(child)
+        self._jump, self._jump_hit = jump, hit
+
+    def contains(self, address: int) -> bool:
+        """Check whether any stored prefix covers an address."""
+        if self._jump is None:
+            self._build_jump_table()
+        # Hand-inlined walk: this is the per-packet threat intel lookup
+        width = self.width
+        keys, lens, left, right, values = (self._keys, self._prefix_lens, self._left,
+                                           self._right, self._values)
+        top = address >> (width - JUMP_BITS)
+        if self._jump_hit[top]:
+            return True
+        node = self._jump[top]
+        while True:
+            node_len = lens[node]
+            if node_len == width:
+                return False
+            node = right[node] if (address >> (width - 1 - node_len)) & 1 else left[node]
+            if not node or (address ^ keys[node]) >> (width - lens[node]):
+                return False
+            if values[node] is not _EMPTY:
+                return True
+
+    def items(self) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (network, prefix length, value) for every stored prefix in address order."""
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._values[node] is not _EMPTY:
+                yield self._keys[node], self._prefix_lens[node], self._values[node]
+            for child in (self._right[node], self._left[node]):
+                if child:
+                    stack.append(child)
+
+    def __len__(self) -> int:
+        return self._count
+
+class PrefixSet:
+    """A set of IPv4/IPv6 networks with longest-prefix membership tests.
+
+    Added networks are merged with overlapping and sibling networks, so a
+    blocklist of individual addresses shrinks to the prefixes that cover it.
+    """
+
+    def __init__(self, networks: Iterable[str] = ()):
+        self._tries = {version: PrefixTrie(width) for version, width in ADDRESS_WIDTHS.items()}
+        grouped = {version: [] for version in ADDRESS_WIDTHS}
+        for network in networks:
+            version, key, prefix_len = parse_network(network)
+            grouped[version].append((key, prefix_len))
+        for version, prefixes in grouped.items():
+            trie = self._tries[version]
+            for key, prefix_len in collapse_prefixes(prefixes, trie.width):
+                trie.insert(key, prefix_len)
+
+    def add(self, network: str) -> None:
+        """Add an address or CIDR network, merging it with its neighbours."""
+        version, key, prefix_len = parse_network(network)
+        trie = self._tries[version]
+        covering = trie.shortest_match(key)
+        if covering and covering[1] <= prefix_len:
+            return
+        trie.delete_covered(key, prefix_len)
+        width = trie.width
+        while prefix_len:
+            sibling = key ^ (1 << (width - prefix_len))
+            if not trie.delete(sibling, prefix_len):
+                break
+            prefix_len -= 1
+            key &= ~(1 << (width - prefix_len - 1))
+        trie.insert(key, prefix_len)
+
+    def discard(self, network: str) -> None:
+        """Remove an address or CIDR network, splitting any prefix that covers it."""
+        version, key, prefix_len = parse_network(network)
+        trie = self._tries[version]
+        width = trie.width
+        covering = trie.longest_match(key)
+        if covering and covering[1] < prefix_len:
+            cover_key, cover_len, _ = covering
+            trie.delete(cover_key, cover_len)
+            start, end = key, key + (1 << (width - prefix_len)) - 1
+            cover_end = cover_key + (1 << (width - cover_len)) - 1
+            for low, high in ((cover_key, start - 1), (end + 1, cover_end)):
+                for part_key, part_len in range_to_prefixes(low, high, width):
+                    trie.insert(part_key, part_len)
+        else:
+            trie.delete_covered(key, prefix_len)
+
+    def covers(self, network: str) -> bool:
+        """Check whether a single stored prefix covers an entire network."""
+        version, key, prefix_len = parse_network(network)
+        covering = self._tries[version].shortest_match(key)
+        return covering is not None and covering[1] <= prefix_len
+
+    def copy(self) -> 'PrefixSet':
+        """Return an independent copy of this set."""
+        return PrefixSet(self)
+
+    def __contains__(self, ip: str) -> bool:
+        try:
+            version, address = parse_address(ip)
+        except (TypeError, ValueError):
+            return False
+        return self._tries[version].contains(address)
+
+    def __iter__(self) -> Iterator[str]:
+        for version, trie in self._tries.items():
+            for key, prefix_len, _ in trie.items():
+                yield format_network(version, key, prefix_len)
+
+    def __len__(self) -> int:
+        return sum(len(trie) for trie in self._tries.values())
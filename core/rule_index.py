@@ -0,0 +1,187 @@
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+from .prefix_trie import ADDRESS_WIDTHS, PrefixTrie, format_network, parse_address, parse_network
+from .packet_parser import PacketRecord
+
+PROTOCOL_NUMBERS = {
+    'ICMP': 1,
+    'TCP': 6,
+    'UDP': 17,
+    'ICMPV6': 58,
+}
+
+def normalize_protocol(protocol) -> Optional[int]:
+    """Convert a protocol name or number to its IP protocol number."""
+    if protocol is None:
+        return None
+    if isinstance(protocol, int):
+        return protocol
+    name = str(protocol).strip().upper()
+    if name.isdigit():
+        return int(name)
+    if name not in PROTOCOL_NUMBERS:
+        raise ValueError(f"Unknown protocol: {protocol}")
+    return PROTOCOL_NUMBERS[name]
+
+def _split_address_match(value: Optional[str]) -> Tuple[Optional[str], Optional[Tuple[int, int, int]]]:
+    """Split a rule address into a canonical host address or a CIDR network."""
+    if not value:
+        return None, None
+    version, network, prefix_len = parse_network(value)
+    if prefix_len == ADDRESS_WIDTHS[version]:
+        return format_network(version, network, prefix_len), None
+    return None, (version, network, prefix_len)
+
+def _in_network(ip: str, network: Tuple[int, int, int]) -> bool:
+    version, address = parse_address(ip)
+    net_version, net, prefix_len = network
+    return version == net_version and not (address ^ net) >> (ADDRESS_WIDTHS[version] - prefix_len)
+
+class CompiledRule:
+    """A rule with its match fields normalized for fast comparison."""
+
+    __slots__ = ('rule', 'order', 'protocol', 'port', 'source_ip', 'dest_ip',
+                 'source_net', 'dest_net')
+
+    def __init__(self, rule, seq: int = 0):
+        self.rule = rule
+        self.order: Tuple[int, int] = (rule.priority, seq)
+        self.protocol = normalize_protocol(rule.protocol)
+        self.port = rule.port
+        self.source_ip, self.source_net = _split_address_match(rule.source_ip)
+        self.dest_ip, self.dest_net = _split_address_match(rule.dest_ip)
+
+    def __lt__(self, other: 'CompiledRule') -> bool:
+        return self.order < other.order
+
+    def matches(self, packet_info: PacketRecord) -> bool:
+        """Check if a packet matches every field set on this rule."""
+        if self.protocol is not None and packet_info.protocol != self.protocol:
+            return False
+        if self.port is not None and packet_info.dest_port != self.port:
+            return False
+        if self.source_ip and packet_info.source_ip != self.source_ip:
+            return False
+        if self.dest_ip and packet_info.dest_ip != self.dest_ip:
+            return False
+        if self.source_net and not _in_network(packet_info.source_ip, self.source_net):
+            return False
+        if self.dest_net and not _in_network(packet_info.dest_ip, self.dest_net):
+            return False
+        return True
+
+class RuleIndex:
+    """Hash-based rule classifier returning the first match in priority order.
+
+    Each rule is filed under its most selective field: an exact source or
+    destination address, a source or destination CIDR network, the port, then
+    the protocol. Rules with no match fields live in a wildcard bucket. Exact
+    fields are hashed and CIDR networks are kept in prefix tries, so a lookup
+    only inspects the buckets for the packet's own field values and the
+    networks covering its addresses. Its cost therefore depends on how many
+    rules share those values rather than on the total number of rules.
+    """
+
+    def __init__(self, rules: Iterable = ()):
+        self.rebuild(rules)
+
+    def rebuild(self, rules: Iterable) -> None:
+        """Discard the current index and compile the given rules."""
+        self._seq = 0
+        self._compiled: Dict[int, CompiledRule] = {}
+        self._by_source: Dict[str, List[CompiledRule]] = {}
+        self._by_dest: Dict[str, List[CompiledRule]] = {}
+        self._by_port: Dict[int, List[CompiledRule]] = {}
+        self._by_protocol: Dict[int, List[CompiledRule]] = {}
+        self._source_prefixes = {version: PrefixTrie(width) for version, width in ADDRESS_WIDTHS.items()}
+        self._dest_prefixes = {version: PrefixTrie(width) for version, width in ADDRESS_WIDTHS.items()}
+        self._prefix_buckets = 0
+        self._wildcard: List[CompiledRule] = []
+        for rule in rules:
+            self.add(rule)
+
+    def _slot_for(self, compiled: CompiledRule) -> Tuple[object, object]:
+        """Return the hash table or prefix trie and key a compiled rule is filed under."""
+        if compiled.source_ip:
+            return self._by_source, compiled.source_ip
+        if compiled.dest_ip:
+            return self._by_dest, compiled.dest_ip
+        if compiled.source_net:
+            version, network, prefix_len = compiled.source_net
+            return self._source_prefixes[version], (network, prefix_len)
+        if compiled.dest_net:
+            version, network, prefix_len = compiled.dest_net
+            return self._dest_prefixes[version], (network, prefix_len)
+        if compiled.port is not None:
+            return self._by_port, compiled.port
+        if compiled.protocol is not None:
+            return self._by_protocol, compiled.protocol
+        return None, None
+
+    def add(self, rule) -> None:
+        """Compile a rule and insert it into its bucket in priority order."""
+        compiled = CompiledRule(rule, self._seq)
+        self._seq += 1
+        table, key = self._slot_for(compiled)
+        if table is None:
+            bucket = self._wildcard
+        elif isinstance(table, PrefixTrie):
+            bucket = table.get(*key)
+            if bucket is None:
+                bucket = []
+                table.insert(*key, bucket)
+                self._prefix_buckets += 1
+        else:
+            bucket = table.setdefault(key, [])
+        bisect.insort(bucket, compiled)
+        self._compiled[id(rule)] = compiled
+
+    def remove(self, rule) -> bool:
+        """Remove a previously added rule. Returns False if it was not indexed."""
+        compiled = self._compiled.pop(id(rule), None)
+        if compiled is None:
+            return False
+        table, key = self._slot_for(compiled)
+        if table is None:
+            self._wildcard.remove(compiled)
+        elif isinstance(table, PrefixTrie):
+            bucket = table.get(*key)
+            bucket.remove(compiled)
+            if not bucket:
+                table.delete(*key)
+                self._prefix_buckets -= 1
+        else:
+            table[key].remove(compiled)
+            if not table[key]:
+                del table[key]
+        return True
+
+    def lookup(self, packet_info: PacketRecord):
+        """Return the highest-priority rule matching the packet, or None."""
+        best: Optional[CompiledRule] = None
+        buckets = [self._by_source.get(packet_info.source_ip),
+                   self._by_dest.get(packet_info.dest_ip),
+                   self._by_port.get(packet_info.dest_port),
+                   self._by_protocol.get(packet_info.protocol),
+                   self._wildcard]
+        if self._prefix_buckets:
+            version, address = parse_address(packet_info.source_ip)
+            buckets.extend(self._source_prefixes[version].matches(address))
+            version, address = parse_address(packet_info.dest_ip)
+            buckets.extend(self._dest_prefixes[version].matches(address))
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for compiled in bucket:
+                if best is not None and not compiled < best:
+                    break
+                if compiled.matches(packet_info):
+                    best = compiled
+                    break
+        return best.rule if best is not None else None
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def __contains__(self, rule) -> bool:
+        return id(rule) in self._compiled
@@ -1,22 +1,72 @@
 import logging
 import requests
-from typing import Set, Dict
+from typing import Set, Dict, Iterator, Optional
 from datetime import datetime, timedelta
 import threading
 import time
+from .prefix_trie import PrefixSet, is_valid_network, networks_overlap
+
+class ThreatSnapshot:
+    """Immutable view of the blocklist that packet lookups read without locking.
+
+    ``networks`` holds the feed data with all manual changes folded in at the
+    last refresh. Manual changes made since then are kept in the small
+    ``added``/``removed`` delta sets so that publishing them does not require
+    copying ``networks``. None of these sets is modified once the snapshot is
+    published; writers build a new snapshot and swap the reference instead.
+    """
+
+    __slots__ = ('networks', 'added', 'removed', 'version')
+
+    def __init__(self, networks: PrefixSet, added: Optional[PrefixSet] = None,
+                 removed: Optional[PrefixSet] = None, version: int = 0):
+        self.networks = networks
+        self.added = added or None
+        self.removed = removed or None
+        self.version = version
+
+    def __contains__(self, ip: str) -> bool:
+        if self.removed is not None and ip in self.removed:
+            return False
+        if self.added is not None and ip in self.added:
+            return True
+        return ip in self.networks
+
+    def __iter__(self) -> Iterator[str]:
+        removed = list(self.removed or ())
+        for network in self.networks:
+            if any(networks_overlap(network, r) for r in removed):
+                remaining = PrefixSet([network])
+                for r in removed:
+                    remaining.discard(r)
+                yield from remaining
+            else:
+                yield network
+        for network in self.added or ():
+            if not self.networks.covers(network):
+                yield network
+
+    def __len__(self) -> int:
+        """Number of stored prefixes, counting pending manual additions."""
+        return len(self.networks) + len(self.added or ())
 
 class ThreatIntelligence:
-    def __init__(self, update_interval: int = 3600):
+    def __init__(self, update_interval: int = 3600, auto_update: bool = True):
         self.logger = logging.getLogger(__name__)
-        self.malicious_ips: Set[str] = set()
+        self._snapshot = ThreatSnapshot(PrefixSet())
+        # Manual additions (True) and removals (False) in the order they were made,
+        # re-applied on top of every feed refresh
+        self._overrides: Dict[str, bool] = {}
         self.last_update = datetime.min
         self.update_interval = update_interval
+        # Serializes writers only; readers never take it
         self.update_lock = threading.Lock()
         
         # Start background updater
         self.updater_thread = threading.Thread(target=self._background_update)
         self.updater_thread.daemon = True
-        self.updater_thread.start()
+        if auto_update:
+            self.updater_thread.start()
     
     def _fetch_threat_feeds(self) -> Set[str]:
         """Fetch and aggregate threat intelligence from multiple sources."""
@@ -53,14 +103,36 @@ class ThreatIntelligence:
         
         return malicious_ips
     
+    @property
+    def snapshot(self) -> ThreatSnapshot:
+        """The currently published blocklist snapshot."""
+        return self._snapshot
+
+    @property
+    def malicious_ips(self) -> ThreatSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Incremented every time a new snapshot is published."""
+        return self._snapshot.version
+
     def _update_threat_intel(self):
         """Update threat intelligence data."""
         try:
+            # Fetch and build the new set without holding the lock
+            new_ips = self._fetch_threat_feeds()
+            networks = PrefixSet(ip for ip in new_ips if is_valid_network(ip))
             with self.update_lock:
-                new_ips = self._fetch_threat_feeds()
-                self.malicious_ips = new_ips
+                for ip, malicious in self._overrides.items():
+                    if malicious:
+                        networks.add(ip)
+                    else:
+                        networks.discard(ip)
+                self._snapshot = ThreatSnapshot(networks, version=self._snapshot.version + 1)
                 self.last_update = datetime.now()
-                self.logger.info(f"Updated threat intelligence: {len(self.malicious_ips)} malicious IPs")
+            self.logger.info(f"Updated threat intelligence: {len(new_ips)} malicious IPs "
+                             f"merged into {len(networks)} prefixes")
         except Exception as e:
             self.logger.error(f"Error updating threat intelligence: {str(e)}")
     
@@ -72,18 +144,33 @@ class ThreatIntelligence:
             time.sleep(60)  # Check every minute
     
     def is_malicious(self, ip: str) -> bool:
-        """Check if an IP is known to be malicious."""
+        """Check if an IP is known to be malicious or falls in a malicious network."""
+        return ip in self._snapshot
+    
+    def _apply_override(self, ip: str, malicious: bool) -> None:
+        """Publish a manual change as a delta on top of the current snapshot."""
+        if not is_valid_network(ip):
+            raise ValueError(f"Invalid IP address or network: {ip}")
         with self.update_lock:
-            return ip in self.malicious_ips
+            self._overrides.pop(ip, None)
+            self._overrides[ip] = malicious
+            current = self._snapshot
+            added = current.added.copy() if current.added else PrefixSet()
+            removed = current.removed.copy() if current.removed else PrefixSet()
+            if malicious:
+                added.add(ip)
+                removed.discard(ip)
+            else:
+                removed.add(ip)
+                added.discard(ip)
+            self._snapshot = ThreatSnapshot(current.networks, added, removed, current.version + 1)
     
     def add_ip(self, ip: str):
-        """Manually add an IP to the threat intelligence."""
-        with self.update_lock:
-            self.malicious_ips.add(ip)
-            self.logger.info(f"Added IP to threat intelligence: {ip}")
+        """Manually add an IP or CIDR network to the threat intelligence."""
+        self._apply_override(ip, True)
+        self.logger.info(f"Added IP to threat intelligence: {ip}")
     
     def remove_ip(self, ip: str):
-        """Manually remove an IP from the threat intelligence."""
-        with self.update_lock:
-            self.malicious_ips.discard(ip)
-            self.logger.info(f"Removed IP from threat intelligence: {ip}")
+        """Manually remove an IP or CIDR network from the threat intelligence."""
+        self._apply_override(ip, False)
+        self.logger.info(f"Removed IP from threat intelligence: {ip}")
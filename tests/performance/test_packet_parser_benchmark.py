@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+import scapy.all as scapy
+from core.packet_parser import PacketRecord, parse_packet
+
+# Set to a capture of real traffic to benchmark against it instead of the
+# synthetic capture written below.
+PCAP_PATH = os.environ.get("PHANTOM_BENCH_PCAP")
+SYNTHETIC_PACKETS = 5000
+
+def write_synthetic_pcap(path, count):
+    """Write an Ethernet capture with a realistic TCP/UDP/IPv6 mix."""
+    rng = random.Random(0)
+    packets = []
+    for _ in range(count):
+        src = f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        kind = rng.random()
+        if kind < 0.7:
+            packet = scapy.IP(src=src, dst="192.168.1.10") / scapy.TCP(
+                sport=rng.randint(1024, 65535), dport=rng.choice([22, 80, 443]), flags="PA") / (b"x" * 64)
+        elif kind < 0.9:
+            packet = scapy.IP(src=src, dst="192.168.1.53") / scapy.UDP(
+                sport=rng.randint(1024, 65535), dport=53) / (b"q" * 32)
+        else:
+            packet = scapy.IPv6(src="2001:db8::1", dst="2001:db8::2") / scapy.TCP(dport=443)
+        packets.append(scapy.Ether(src="02:00:00:00:00:01", dst="02:00:00:00:00:02") / packet)
+    scapy.wrpcap(path, packets)
+
+def load_payloads(path):
+    """Return the raw IP layer of every IPv4/IPv6 packet in a capture."""
+    payloads = []
+    for packet in scapy.rdpcap(path):
+        for layer in (scapy.IP, scapy.IPv6):
+            if layer in packet:
+                payloads.append(bytes(packet[layer]))
+                break
+    return payloads
+
+def scapy_path(payload):
+    """What FirewallEngine.process_packet used to do for every packet."""
+    packet = scapy.IP(payload)
+    return packet.src, packet.dst, packet.proto
+
+def measure_pps(parse, payloads, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            parse(payload)
+    return rounds * len(payloads) / (time.perf_counter() - start)
+
+class TestPacketParserBenchmark(unittest.TestCase):
+
+    def test_parser_against_scapy(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = PCAP_PATH
+            if not path:
+                path = os.path.join(tmp, "synthetic.pcap")
+                write_synthetic_pcap(path, SYNTHETIC_PACKETS)
+            payloads = load_payloads(path)
+        self.assertTrue(payloads)
+
+        scapy_pps = measure_pps(scapy_path, payloads, 1)
+        record = PacketRecord()
+        parser_pps = measure_pps(lambda payload: parse_packet(payload, record), payloads, 5)
+
+        print(f"\n{len(payloads)} packets from {PCAP_PATH or 'synthetic capture'}")
+        print(f"scapy.IP():     {scapy_pps:>10.0f} pps")
+        print(f"parse_packet(): {parser_pps:>10.0f} pps ({parser_pps / scapy_pps:.0f}x)")
+
+        self.assertGreater(parser_pps, scapy_pps * 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import sys
+import time
+import unittest
+from core.prefix_trie import PrefixSet, format_network
+
+FEED_SIZE = 200000
+LOOKUPS = 100000
+
+def generate_feed(size):
+    """Simulate a feed where most addresses come from a few hundred dirty /24s."""
+    rng = random.Random(42)
+    subnets = [rng.getrandbits(24) << 8 for _ in range(size // 300)]
+    feed = set()
+    while len(feed) < size:
+        if rng.random() < 0.9:
+            address = rng.choice(subnets) | rng.getrandbits(8)
+        else:
+            address = rng.getrandbits(32)
+        feed.add(address)
+    return list(feed)
+
+def measure(build):
+    start = time.perf_counter()
+    structure = build()
+    return structure, time.perf_counter() - start
+
+def string_set_size(string_set):
+    return sys.getsizeof(string_set) + sum(sys.getsizeof(ip) for ip in string_set)
+
+def prefix_set_size(prefix_set):
+    total = 0
+    for trie in prefix_set._tries.values():
+        total += sum(sys.getsizeof(part) for part in (
+            trie._keys, trie._prefix_lens, trie._left, trie._right, trie._values,
+            trie._jump, trie._jump_hit))
+    return total
+
+class TestPrefixSetBenchmark(unittest.TestCase):
+
+    def test_prefix_set_against_string_set(self):
+        feed = generate_feed(FEED_SIZE)
+        rng = random.Random(1)
+        probes = [format_network(4, rng.choice(feed) if rng.random() < 0.5 else rng.getrandbits(32), 32)
+                  for _ in range(LOOKUPS)]
+
+        # Both structures are built from freshly formatted strings, as they are
+        # when parsed out of a feed response, so the set pays for its strings.
+        string_set, set_build = measure(
+            lambda: {format_network(4, address, 32) for address in feed})
+        prefix_set, trie_build = measure(
+            lambda: PrefixSet(format_network(4, address, 32) for address in feed))
+        prefix_set.__contains__(probes[0])  # build the lazy jump table outside the timing
+        set_memory = string_set_size(string_set)
+        trie_memory = prefix_set_size(prefix_set)
+
+        start = time.perf_counter()
+        set_hits = sum(1 for ip in probes if ip in string_set)
+        set_lookup = (time.perf_counter() - start) / LOOKUPS
+
+        start = time.perf_counter()
+        trie_hits = sum(1 for ip in probes if ip in prefix_set)
+        trie_lookup = (time.perf_counter() - start) / LOOKUPS
+
+        print(f"\n{'structure':<12} {'entries':>9} {'build s':>8} {'memory MB':>10} {'ns/lookup':>10}")
+        print(f"{'set[str]':<12} {len(string_set):>9} {set_build:>8.2f} "
+              f"{set_memory / 1e6:>10.1f} {set_lookup * 1e9:>10.0f}")
+        print(f"{'PrefixSet':<12} {len(prefix_set):>9} {trie_build:>8.2f} "
+              f"{trie_memory / 1e6:>10.1f} {trie_lookup * 1e9:>10.0f}")
+
+        # Merged prefixes can only cover more addresses, never fewer
+        self.assertGreaterEqual(trie_hits, set_hits)
+        self.assertLess(len(prefix_set), len(string_set))
+        self.assertLess(trie_memory, set_memory)
+
+if __name__ == "__main__":
+    unittest.main()
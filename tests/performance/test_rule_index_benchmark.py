@@ -0,0 +1,58 @@
+import random
+import time
+import unittest
+from core.engine import Rule
+from core.packet_parser import PacketRecord
+from core.rule_index import RuleIndex
+
+RULE_COUNTS = [10, 100, 1000, 10000, 100000]
+LOOKUPS = 20000
+
+def generate_rules(count):
+    """Build a production-like rule set: mostly per-host rules plus a few broad ones."""
+    rng = random.Random(count)
+    rules = [
+        Rule(name="allow https", priority=50, action="ACCEPT", protocol="TCP", port=443),
+        Rule(name="log dns", priority=60, action="LOG", protocol="UDP", port=53),
+        Rule(name="default log", priority=1000, action="LOG"),
+    ]
+    for i in range(count - len(rules)):
+        rules.append(Rule(
+            name=f"host-{i}",
+            priority=rng.randint(1, 999),
+            action=rng.choice(["ACCEPT", "DROP"]),
+            source_ip=f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+        ))
+    return rules
+
+def generate_packets(count):
+    rng = random.Random(0)
+    return [PacketRecord(
+        source_ip=f"10.{rng.randint(0, 1)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+        dest_ip=f"192.168.1.{rng.randint(1, 254)}",
+        protocol=rng.choice([6, 17]),
+        dest_port=rng.choice([22, 53, 80, 443]),
+    ) for _ in range(count)]
+
+class TestRuleIndexBenchmark(unittest.TestCase):
+
+    def test_lookup_time_is_flat_across_rule_counts(self):
+        packets = generate_packets(LOOKUPS)
+        timings = {}
+        for count in RULE_COUNTS:
+            index = RuleIndex(generate_rules(count))
+            start = time.perf_counter()
+            for packet in packets:
+                index.lookup(packet)
+            timings[count] = (time.perf_counter() - start) / LOOKUPS
+
+        print("\nrules      ns/lookup")
+        for count, seconds in timings.items():
+            print(f"{count:<10} {seconds * 1e9:>9.0f}")
+
+        # A linear scan grows 10000x over this range; allow for cache effects
+        # and the higher exact-match hit rate of the larger rule sets.
+        self.assertLess(timings[RULE_COUNTS[-1]], timings[RULE_COUNTS[0]] * 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import threading
+import time
+import unittest
+from core.prefix_trie import format_network
+from core.threat_intel import ThreatIntelligence
+
+READER_THREADS = 4
+FEED_DELAY = 1.0
+FEED_SIZE = 50000
+
+class TestThreatIntelContention(unittest.TestCase):
+
+    def test_readers_are_not_blocked_by_slow_refresh(self):
+        threat_intel = ThreatIntelligence(auto_update=False)
+        rng = random.Random(0)
+        feed = {format_network(4, rng.getrandbits(32), 32) for _ in range(FEED_SIZE)}
+        probes = list(feed)[:1000] + [format_network(4, rng.getrandbits(32), 32) for _ in range(1000)]
+
+        def slow_fetch():
+            time.sleep(FEED_DELAY)  # simulated feed download
+            return feed
+
+        threat_intel._fetch_threat_feeds = slow_fetch
+        stop = threading.Event()
+        latencies = [[] for _ in range(READER_THREADS)]
+
+        def reader(samples):
+            i = 0
+            while not stop.is_set():
+                ip = probes[i % len(probes)]
+                start = time.perf_counter()
+                threat_intel.is_malicious(ip)
+                samples.append(time.perf_counter() - start)
+                i += 1
+
+        readers = [threading.Thread(target=reader, args=(samples,)) for samples in latencies]
+        for thread in readers:
+            thread.start()
+        refresh_start = time.perf_counter()
+        threat_intel._update_threat_intel()
+        refresh_time = time.perf_counter() - refresh_start
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        samples = sorted(s for per_thread in latencies for s in per_thread)
+        p50 = samples[len(samples) // 2]
+        p99 = samples[int(len(samples) * 0.99)]
+        print(f"\nrefresh {refresh_time:.2f}s, {len(samples)} reads by {READER_THREADS} threads: "
+              f"p50 {p50 * 1e6:.1f}us p99 {p99 * 1e6:.1f}us max {samples[-1] * 1e3:.1f}ms")
+
+        self.assertTrue(threat_intel.is_malicious(probes[0]))
+        # With the old lock-held fetch every read issued during the refresh
+        # stalled for the whole download; now reads only wait on the GIL.
+        self.assertLess(samples[-1], FEED_DELAY)
+        self.assertLess(p99, 0.01)
+        self.assertGreater(len(samples), READER_THREADS * 1000)
+
+if __name__ == "__main__":
+    unittest.main()
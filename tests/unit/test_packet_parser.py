@@ -0,0 +1,53 @@
+import unittest
+import scapy.all as scapy
+from core.packet_parser import PROTO_TCP, PROTO_UDP, TCP_SYN, parse_packet, PacketRecord
+
+class TestPacketParser(unittest.TestCase):
+
+    def test_ipv4_tcp(self):
+        payload = bytes(scapy.IP(src="10.0.0.1", dst="192.168.1.2") /
+                        scapy.TCP(sport=40000, dport=443, flags="S"))
+        record = parse_packet(payload)
+        self.assertEqual(record.version, 4)
+        self.assertEqual(record.source_ip, "10.0.0.1")
+        self.assertEqual(record.dest_ip, "192.168.1.2")
+        self.assertEqual(record.protocol, PROTO_TCP)
+        self.assertEqual((record.source_port, record.dest_port), (40000, 443))
+        self.assertEqual(record.tcp_flags, TCP_SYN)
+        self.assertEqual(record.length, len(payload))
+
+    def test_ipv4_with_options_and_udp(self):
+        payload = bytes(scapy.IP(src="10.0.0.1", dst="10.0.0.2", options=[scapy.IPOption(b"\x94\x04\x00\x00")]) /
+                        scapy.UDP(sport=5353, dport=53))
+        record = parse_packet(payload)
+        self.assertEqual(record.protocol, PROTO_UDP)
+        self.assertEqual((record.source_port, record.dest_port), (5353, 53))
+
+    def test_ipv4_non_first_fragment_has_no_ports(self):
+        payload = bytes(scapy.IP(src="10.0.0.1", dst="10.0.0.2", frag=100, proto=6) / (b"x" * 20))
+        record = parse_packet(payload)
+        self.assertIsNone(record.dest_port)
+
+    def test_ipv6_with_extension_header(self):
+        payload = bytes(scapy.IPv6(src="2001:db8::1", dst="2001:db8::2") /
+                        scapy.IPv6ExtHdrHopByHop() /
+                        scapy.TCP(sport=1234, dport=22))
+        record = parse_packet(payload)
+        self.assertEqual(record.version, 6)
+        self.assertEqual(record.source_ip, "2001:db8::1")
+        self.assertEqual(record.protocol, PROTO_TCP)
+        self.assertEqual(record.dest_port, 22)
+
+    def test_record_reuse_clears_transport_fields(self):
+        record = parse_packet(bytes(scapy.IP() / scapy.TCP(dport=80)))
+        parse_packet(bytes(scapy.IP() / scapy.ICMP()), record)
+        self.assertIsNone(record.dest_port)
+        self.assertEqual(record.tcp_flags, 0)
+
+    def test_invalid_payloads(self):
+        for payload in (b"", b"\x45\x00", b"\x20" + b"\x00" * 40):
+            with self.assertRaises(ValueError):
+                parse_packet(payload)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import ipaddress
+import random
+import unittest
+from core.prefix_trie import PrefixSet, PrefixTrie, collapse_prefixes, parse_network
+
+class TestPrefixTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = PrefixTrie(32)
+
+    def insert(self, network):
+        _, key, prefix_len = parse_network(network)
+        self.trie.insert(key, prefix_len, network)
+
+    def address(self, ip):
+        return int(ipaddress.IPv4Address(ip))
+
+    def test_longest_match(self):
+        for network in ["10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24"]:
+            self.insert(network)
+        self.assertEqual(self.trie.longest_match(self.address("10.1.2.3"))[2], "10.1.2.0/24")
+        self.assertEqual(self.trie.longest_match(self.address("10.1.9.9"))[2], "10.1.0.0/16")
+        self.assertEqual(self.trie.longest_match(self.address("10.9.9.9"))[2], "10.0.0.0/8")
+        self.assertIsNone(self.trie.longest_match(self.address("11.0.0.1")))
+
+    def test_matches_returns_all_covering_prefixes(self):
+        for network in ["0.0.0.0/0", "10.1.2.0/24", "10.0.0.0/8", "10.1.2.3"]:
+            self.insert(network)
+        self.assertEqual(self.trie.matches(self.address("10.1.2.3")),
+                         ["0.0.0.0/0", "10.0.0.0/8", "10.1.2.0/24", "10.1.2.3"])
+
+    def test_delete(self):
+        self.insert("10.0.0.0/8")
+        self.insert("10.1.0.0/16")
+        _, key, prefix_len = parse_network("10.1.0.0/16")
+        self.assertTrue(self.trie.delete(key, prefix_len))
+        self.assertFalse(self.trie.delete(key, prefix_len))
+        self.assertEqual(self.trie.longest_match(self.address("10.1.0.1"))[2], "10.0.0.0/8")
+        self.assertEqual(len(self.trie), 1)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        networks = set()
+        for _ in range(300):
+            prefix_len = rng.choice([8, 16, 20, 24, 28, 32])
+            network = ipaddress.IPv4Network((rng.getrandbits(32), prefix_len), strict=False)
+            networks.add(network)
+            self.trie.insert(int(network.network_address), prefix_len, network)
+        for _ in range(2000):
+            address = ipaddress.IPv4Address(rng.getrandbits(32))
+            expected = sorted((n for n in networks if address in n), key=lambda n: n.prefixlen)
+            self.assertEqual(self.trie.matches(int(address)), expected)
+
+class TestPrefixSet(unittest.TestCase):
+
+    def test_collapses_adjacent_addresses(self):
+        prefixes = PrefixSet(f"192.168.1.{i}" for i in range(256))
+        self.assertEqual(list(prefixes), ["192.168.1.0/24"])
+        self.assertIn("192.168.1.77", prefixes)
+        self.assertNotIn("192.168.2.1", prefixes)
+
+    def test_add_merges_siblings(self):
+        prefixes = PrefixSet(["10.0.0.0/25"])
+        prefixes.add("10.0.0.128/25")
+        self.assertEqual(list(prefixes), ["10.0.0.0/24"])
+        prefixes.add("10.0.0.5")
+        self.assertEqual(len(prefixes), 1)
+
+    def test_discard_splits_covering_prefix(self):
+        prefixes = PrefixSet(["10.0.0.0/24"])
+        prefixes.discard("10.0.0.5")
+        self.assertNotIn("10.0.0.5", prefixes)
+        self.assertIn("10.0.0.4", prefixes)
+        self.assertIn("10.0.0.6", prefixes)
+        self.assertEqual(len(list(ipaddress.collapse_addresses(
+            ipaddress.ip_network(n) for n in prefixes))), 8)
+
+    def test_ipv6_and_invalid_addresses(self):
+        prefixes = PrefixSet(["2001:db8::/32"])
+        self.assertIn("2001:db8::1", prefixes)
+        self.assertNotIn("2001:db9::1", prefixes)
+        self.assertNotIn("not-an-ip", prefixes)
+
+    def test_collapse_prefixes(self):
+        self.assertEqual(collapse_prefixes([(0, 32), (1, 32), (2, 31)], 32), [(0, 30)])
+
+if __name__ == "__main__":
+    unittest.main()
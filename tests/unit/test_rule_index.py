@@ -0,0 +1,73 @@
+import unittest
+from core.engine import Rule
+from core.packet_parser import PacketRecord
+from core.rule_index import RuleIndex, normalize_protocol
+
+def make_packet(source_ip="10.0.0.1", dest_ip="192.168.1.2", protocol=6, dest_port=None):
+    return PacketRecord(source_ip=source_ip, dest_ip=dest_ip, protocol=protocol, dest_port=dest_port)
+
+class TestRuleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = RuleIndex()
+
+    def test_no_rules_returns_none(self):
+        self.assertIsNone(self.index.lookup(make_packet()))
+
+    def test_first_match_in_priority_order(self):
+        low = Rule(name="allow all", priority=10, action="ACCEPT")
+        high = Rule(name="block host", priority=1, action="DROP", source_ip="10.0.0.1")
+        self.index.add(low)
+        self.index.add(high)
+        self.assertIs(self.index.lookup(make_packet()), high)
+        self.assertIs(self.index.lookup(make_packet(source_ip="10.0.0.2")), low)
+
+    def test_wildcard_rule_beats_lower_priority_exact_rule(self):
+        wildcard = Rule(name="log all", priority=1, action="LOG")
+        exact = Rule(name="block host", priority=5, action="DROP", source_ip="10.0.0.1")
+        self.index.rebuild([exact, wildcard])
+        self.assertIs(self.index.lookup(make_packet()), wildcard)
+
+    def test_equal_priority_keeps_insertion_order(self):
+        first = Rule(name="first", priority=1, action="DROP", protocol="TCP")
+        second = Rule(name="second", priority=1, action="ACCEPT", protocol="TCP")
+        self.index.rebuild([first, second])
+        self.assertIs(self.index.lookup(make_packet()), first)
+
+    def test_all_fields_must_match(self):
+        rule = Rule(name="ssh", priority=1, action="DROP", protocol="TCP",
+                    port=22, source_ip="10.0.0.1")
+        self.index.add(rule)
+        self.assertIs(self.index.lookup(make_packet(dest_port=22)), rule)
+        self.assertIsNone(self.index.lookup(make_packet(dest_port=80)))
+        self.assertIsNone(self.index.lookup(make_packet(protocol=17, dest_port=22)))
+
+    def test_cidr_rules(self):
+        subnet = Rule(name="block subnet", priority=5, action="DROP", source_ip="10.0.0.0/16")
+        host = Rule(name="allow host", priority=1, action="ACCEPT", source_ip="10.0.0.1/32")
+        dest = Rule(name="log servers", priority=3, action="LOG", dest_ip="192.168.0.0/16")
+        self.index.rebuild([subnet, host, dest])
+        self.assertIs(self.index.lookup(make_packet()), host)
+        self.assertIs(self.index.lookup(make_packet(source_ip="10.0.9.9")), dest)
+        self.assertIs(self.index.lookup(make_packet(source_ip="10.0.9.9", dest_ip="172.16.0.1")), subnet)
+        self.assertIsNone(self.index.lookup(make_packet(source_ip="10.1.0.1", dest_ip="172.16.0.1")))
+        self.index.remove(dest)
+        self.assertIs(self.index.lookup(make_packet(source_ip="10.0.9.9")), subnet)
+
+    def test_remove_rule(self):
+        rule = Rule(name="block host", priority=1, action="DROP", dest_ip="192.168.1.2")
+        self.index.add(rule)
+        self.assertTrue(self.index.remove(rule))
+        self.assertFalse(self.index.remove(rule))
+        self.assertIsNone(self.index.lookup(make_packet()))
+        self.assertEqual(len(self.index), 0)
+
+    def test_normalize_protocol(self):
+        self.assertEqual(normalize_protocol("tcp"), 6)
+        self.assertEqual(normalize_protocol("17"), 17)
+        self.assertIsNone(normalize_protocol(None))
+        with self.assertRaises(ValueError):
+            normalize_protocol("BOGUS")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from core.threat_intel import ThreatIntelligence
+
+class TestThreatIntelligence(unittest.TestCase):
+
+    def setUp(self):
+        self.threat_intel = ThreatIntelligence(auto_update=False)
+
+    def test_cidr_blocks_whole_network(self):
+        self.threat_intel.add_ip("203.0.113.0/24")
+        self.assertTrue(self.threat_intel.is_malicious("203.0.113.200"))
+        self.assertFalse(self.threat_intel.is_malicious("203.0.114.1"))
+
+    def test_remove_ip_from_network(self):
+        self.threat_intel.add_ip("203.0.113.0/24")
+        self.threat_intel.remove_ip("203.0.113.7")
+        self.assertFalse(self.threat_intel.is_malicious("203.0.113.7"))
+        self.assertTrue(self.threat_intel.is_malicious("203.0.113.8"))
+
+    def test_update_merges_feed_entries(self):
+        feed = {f"198.51.100.{i}" for i in range(256)} | {"bogus"}
+        self.threat_intel._fetch_threat_feeds = lambda: feed
+        self.threat_intel._update_threat_intel()
+        self.assertEqual(list(self.threat_intel.malicious_ips), ["198.51.100.0/24"])
+        self.assertTrue(self.threat_intel.is_malicious("198.51.100.42"))
+
+    def test_manual_changes_survive_refresh(self):
+        self.threat_intel.add_ip("192.0.2.1")
+        self.threat_intel.remove_ip("198.51.100.9")
+        self.threat_intel._fetch_threat_feeds = lambda: {"198.51.100.9", "198.51.100.10"}
+        self.threat_intel._update_threat_intel()
+        self.assertTrue(self.threat_intel.is_malicious("192.0.2.1"))
+        self.assertFalse(self.threat_intel.is_malicious("198.51.100.9"))
+        self.assertTrue(self.threat_intel.is_malicious("198.51.100.10"))
+
+    def test_snapshot_is_replaced_not_mutated(self):
+        before = self.threat_intel.snapshot
+        self.threat_intel.add_ip("192.0.2.1")
+        self.assertIsNot(self.threat_intel.snapshot, before)
+        self.assertNotIn("192.0.2.1", before)
+        self.assertEqual(self.threat_intel.version, before.version + 1)
+
+    def test_snapshot_iterates_effective_networks(self):
+        self.threat_intel._fetch_threat_feeds = lambda: {"198.51.100.0/30"}
+        self.threat_intel._update_threat_intel()
+        self.threat_intel.remove_ip("198.51.100.1")
+        self.threat_intel.add_ip("192.0.2.1")
+        self.assertEqual(sorted(self.threat_intel.malicious_ips),
+                         ["192.0.2.1", "198.51.100.0", "198.51.100.2/31"])
+
+    def test_reads_do_not_wait_for_writers(self):
+        with self.threat_intel.update_lock:
+            self.assertFalse(self.threat_intel.is_malicious("192.0.2.1"))
+
+if __name__ == "__main__":
+    unittest.main()